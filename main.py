@@ -1,17 +1,34 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import BackgroundTasks, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import os
+import io
+import asyncio
+import sys
 import json
 import subprocess
 import shutil
-from pathlib import Path
+from pathlib import Path, PurePosixPath
+import posixpath
 import ast
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set, TextIO, Tuple
 import tempfile
+import functools
+import time
+import threading
+import multiprocessing
+import heapq
+import hashlib
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from graphlib import CycleError, TopologicalSorter
 
-app = FastAPI()
+# orjson serializes the large repository maps much faster than the stdlib encoder
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Enable CORS for frontend
 app.add_middleware(
@@ -25,6 +42,127 @@ app.add_middleware(
 class RepoRequest(BaseModel):
     repo_url: str
 
+# ast.parse only accepts ``optimize`` from Python 3.13 on; it runs the C-level
+# AST optimizer so the tree handed to the visitor is already folded.
+_PARSE_OPTIONS = {'optimize': 2} if sys.version_info >= (3, 13) else {}
+
+# Directory and file names never descended into or analyzed
+_IGNORE_DIRS = frozenset({'node_modules', '__pycache__', 'venv', '.git', 'dist', 'build'})
+
+# Files above _MAX_ANALYZED_BYTES are not parsed; a NUL byte within the first
+# _BINARY_SNIFF_BYTES marks a file as binary regardless of its encoding
+_MAX_ANALYZED_BYTES = 2_000_000
+_BINARY_SNIFF_BYTES = 8192
+
+# Simple regex patterns for JS/TS, fused into one alternation so the file is
+# scanned once. Each branch has a single named group, reported by lastgroup.
+# The arrow body may contain a lone '=' (default parameters) and ends at the
+# first '=>'; no character can be consumed two ways, so it never backtracks.
+_JS_COMBINED_RE = re.compile(
+    r'import[^\n]*?from [\'"](?P<import>[^\'"]+)[\'"]'
+    r'|function\s+(?P<function>\w+)'
+    r'|const\s+(?P<arrow>\w+)\s*=(?:[^=\n]|=(?!>))*=>'
+    r'|\bclass\s+(?P<class>\w+)'
+)
+
+# Extensions tried when resolving relative JS/TS imports
+_JS_SUFFIXES = ('.js', '.jsx', '.ts', '.tsx')
+
+# Guided tour lines for files, keyed by analysis type: the analysis list whose
+# length is reported, and the template used when that list is non-empty
+_TOUR_FILE_TEMPLATES = {
+    'python': ('classes', "{indent}- **{name}** - Python module with {count} classes\n"),
+    'javascript': ('functions', "{indent}- **{name}** - JavaScript file with {count} functions\n"),
+}
+_TOUR_DEFAULT_TEMPLATE = "{indent}- **{name}** - {lines} lines\n"
+
+class PythonFileVisitor(ast.NodeVisitor):
+    """Collect imports, classes and module-level functions from a Python module.
+
+    Only statement-bearing fields are descended into: imports, classes and
+    function definitions can never appear inside an expression, so walking
+    expression subtrees (as ``ast.walk`` does) is wasted work. The enclosing
+    class/function scopes are tracked on a stack so methods and nested
+    helpers are told apart from module-level functions in O(1).
+    """
+
+    STMT_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+    DOCSTRING_NODES = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+    def __init__(self):
+        self.imports = []
+        self.classes = []
+        self.functions = []
+        self.dependencies = set()
+        self._scope_stack = []
+        self._dispatch = {
+            ast.Import: self.visit_Import,
+            ast.ImportFrom: self.visit_ImportFrom,
+            ast.ClassDef: self.visit_ClassDef,
+            ast.FunctionDef: self.visit_FunctionDef,
+            ast.AsyncFunctionDef: self.visit_AsyncFunctionDef,
+        }
+
+    def visit(self, node: ast.AST) -> None:
+        handler = self._dispatch.get(type(node))
+        if handler is not None:
+            handler(node)
+        else:
+            self.generic_visit(node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        for field in self.STMT_FIELDS:
+            children = getattr(node, field, ())
+            if field == 'body' and self._has_docstring(node):
+                children = islice(children, 1, None)
+            for child in children:
+                self.visit(child)
+
+    def _has_docstring(self, node: ast.AST) -> bool:
+        """Whether the leading statement of ``node.body`` is a docstring"""
+        return (
+            isinstance(node, self.DOCSTRING_NODES) and
+            ast.get_docstring(node, clean=False) is not None
+        )
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.imports.append(alias.name)
+            self.dependencies.add(alias.name.split('.')[0])
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module:
+            self.imports.append(f"from {node.module}")
+            self.dependencies.add(node.module.split('.')[0])
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.classes.append({
+            'name': node.name,
+            'line': node.lineno,
+            'methods': [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
+        })
+        self._scope_stack.append(node)
+        self.generic_visit(node)
+        self._scope_stack.pop()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        if not self._scope_stack:
+            self.functions.append({
+                'name': node.name,
+                'line': node.lineno,
+                'args': [arg.arg for arg in node.args.args]
+            })
+        self._scope_stack.append(node)
+        self.generic_visit(node)
+        self._scope_stack.pop()
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        # Coroutines are not listed as functions, but still open a scope so
+        # helpers nested inside them are not mistaken for module-level ones
+        self._scope_stack.append(node)
+        self.generic_visit(node)
+        self._scope_stack.pop()
+
 class RepoAnalysis:
     def __init__(self, repo_path: str):
         self.repo_path = Path(repo_path)
@@ -33,6 +171,10 @@ class RepoAnalysis:
         self.dependencies = set()
         self.total_lines = 0
         self.total_files = 0
+        self._top_deps = []
+        self.edges = []
+        self.module_files = {}
+        self.module_graph = {}
         
     def analyze_python_file(self, file_path: Path) -> Dict[str, Any]:
         """Analyze a Python file for classes, functions, and imports"""
@@ -40,44 +182,21 @@ class RepoAnalysis:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
                 
-            tree = ast.parse(content)
-            
-            imports = []
-            classes = []
-            functions = []
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(alias.name)
-                        self.dependencies.add(alias.name.split('.')[0])
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        imports.append(f"from {node.module}")
-                        self.dependencies.add(node.module.split('.')[0])
-                elif isinstance(node, ast.ClassDef):
-                    classes.append({
-                        'name': node.name,
-                        'line': node.lineno,
-                        'methods': [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
-                    })
-                elif isinstance(node, ast.FunctionDef):
-                    if not any(node.lineno >= cls['line'] for cls in classes):
-                        functions.append({
-                            'name': node.name,
-                            'line': node.lineno,
-                            'args': [arg.arg for arg in node.args.args]
-                        })
-            
+            tree = ast.parse(content, filename=str(file_path), **_PARSE_OPTIONS)
+
+            visitor = PythonFileVisitor()
+            visitor.visit(tree)
+            self.dependencies.update(visitor.dependencies)
+
             lines = len(content.splitlines())
             self.total_lines += lines
             
             return {
                 'type': 'python',
                 'lines': lines,
-                'imports': imports,
-                'classes': classes,
-                'functions': functions,
+                'imports': visitor.imports,
+                'classes': visitor.classes,
+                'functions': visitor.functions,
                 'content_preview': content[:200] + '...' if len(content) > 200 else content
             }
             
@@ -90,10 +209,13 @@ class RepoAnalysis:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Simple regex patterns for JS/TS
-            imports = re.findall(r'import.*from [\'"]([^\'"]+)[\'"]', content)
-            functions = re.findall(r'function\s+(\w+)|const\s+(\w+)\s*=.*=>', content)
-            classes = re.findall(r'class\s+(\w+)', content)
+            imports = []
+            functions = []
+            classes = []
+            found = {'import': imports, 'function': functions, 'arrow': functions, 'class': classes}
+            for match in _JS_COMBINED_RE.finditer(content):
+                kind = match.lastgroup
+                found[kind].append(match.group(kind))
             
             for imp in imports:
                 self.dependencies.add(imp.split('/')[0] if '/' in imp else imp)
@@ -105,7 +227,7 @@ class RepoAnalysis:
                 'type': 'javascript',
                 'lines': lines,
                 'imports': imports,
-                'functions': [f[0] or f[1] for f in functions],
+                'functions': functions,
                 'classes': classes,
                 'content_preview': content[:200] + '...' if len(content) > 200 else content
             }
@@ -113,83 +235,276 @@ class RepoAnalysis:
         except Exception as e:
             return {'type': 'javascript', 'error': str(e), 'lines': 0}
     
+    def _looks_binary(self, file_path: Path) -> bool:
+        """Treat a file as binary if its head contains a NUL byte"""
+        with open(file_path, 'rb') as f:
+            return b'\0' in f.read(_BINARY_SNIFF_BYTES)
+    
+    def _count_lines(self, file_path: Path, chunk_size: int = 1 << 20) -> int:
+        """Count lines exactly as str.splitlines would, without loading the whole file"""
+        lines = 0
+        open_line = False
+        carry = ''
+        # newline='' keeps the raw line breaks so splitlines sees every kind
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            for chunk in iter(lambda: f.read(chunk_size), ''):
+                text = carry + chunk
+                # A trailing '\r' may be the first half of a '\r\n' pair
+                carry = '\r' if text.endswith('\r') else ''
+                if carry:
+                    text = text[:-1]
+                parts = text.splitlines(keepends=True)
+                if not parts:
+                    continue
+                last = parts[-1]
+                open_line = len(last.splitlines()[0]) == len(last)
+                lines += len(parts) - open_line
+        if carry:
+            return lines + 1
+        return lines + open_line
+    
+    def _analyze_text(self, file_path: Path) -> Dict[str, Any]:
+        """Fallback analysis for files without a language-specific analyzer"""
+        try:
+            if self._looks_binary(file_path):
+                return {'type': 'binary', 'lines': 0}
+            with open(file_path, 'r', encoding='utf-8') as f:
+                preview = f.read(201)
+            # Decodes the whole file, so invalid UTF-8 anywhere still means binary
+            lines = self._count_lines(file_path)
+            self.total_lines += lines
+            return {
+                'type': 'text',
+                'lines': lines,
+                'content_preview': preview[:200] + '...' if len(preview) > 200 else preview
+            }
+        except:
+            return {'type': 'binary', 'lines': 0}
+    
     def analyze_file(self, file_path: Path) -> Dict[str, Any]:
         """Analyze any file based on its extension"""
-        suffix = file_path.suffix.lower()
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            return {'type': 'binary', 'lines': 0}
         
-        if suffix == '.py':
-            return self.analyze_python_file(file_path)
-        elif suffix in ['.js', '.jsx', '.ts', '.tsx']:
-            return self.analyze_javascript_file(file_path)
-        else:
+        # Minified bundles and vendored data only add noise, so skip parsing them
+        if size > _MAX_ANALYZED_BYTES:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                lines = len(content.splitlines())
-                self.total_lines += lines
-                return {
-                    'type': 'text',
-                    'lines': lines,
-                    'content_preview': content[:200] + '...' if len(content) > 200 else content
-                }
-            except:
+                if self._looks_binary(file_path):
+                    return {'type': 'binary', 'lines': 0}
+                # Same rule as _analyze_text: UTF-8 throughout, counted like splitlines
+                lines = self._count_lines(file_path)
+            except (OSError, ValueError):
                 return {'type': 'binary', 'lines': 0}
+            self.total_lines += lines
+            return {'type': 'large', 'lines': lines}
+        
+        handler = _SUFFIX_DISPATCH.get(file_path.suffix.lower())
+        return handler(self, file_path) if handler else self._analyze_text(file_path)
     
-    def build_file_tree(self, path: Path, max_depth: int = 4, current_depth: int = 0) -> Dict[str, Any]:
-        """Build a file tree structure"""
-        if current_depth > max_depth:
-            return {}
-            
-        tree = {}
+    def is_ignored(self, name: str) -> bool:
+        """Skip hidden files and common ignore patterns"""
+        return name.startswith('.') or name in _IGNORE_DIRS
+    
+    def collect_files(self, path: str, max_depth: int = 4) -> List[Tuple[str, str]]:
+        """Collect (path, repo-relative path) pairs for the files to analyze, without reading them"""
+        files = []
+        self._scan_directory(path, "", max_depth, 0, files)
+        return files
+    
+    def _scan_directory(self, path: str, rel_prefix: str, max_depth: int, current_depth: int,
+                        files: List[Tuple[str, str]]) -> None:
+        """Append the files under path to files, depth-first in name order"""
+        # DirEntry caches the d_type from the directory read, so the
+        # is_file/is_dir checks below need no extra stat calls
         try:
-            for item in sorted(path.iterdir()):
-                # Skip hidden files and common ignore patterns
-                if item.name.startswith('.') or item.name in ['node_modules', '__pycache__', 'venv']:
-                    continue
-                
-                if item.is_file():
-                    self.total_files += 1
-                    file_analysis = self.analyze_file(item)
-                    tree[item.name] = {
-                        'type': 'file',
-                        'path': str(item.relative_to(self.repo_path)),
-                        'analysis': file_analysis
-                    }
-                elif item.is_dir():
-                    subtree = self.build_file_tree(item, max_depth, current_depth + 1)
-                    if subtree:  # Only include if not empty
-                        tree[item.name] = {
-                            'type': 'directory',
-                            'children': subtree
-                        }
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name)
         except PermissionError:
-            pass
+            return
+        
+        for entry in entries:
+            if self.is_ignored(entry.name):
+                continue
+            
+            if entry.is_file(follow_symlinks=False):
+                files.append((entry.path, rel_prefix + entry.name))
+            elif entry.is_dir(follow_symlinks=False) and current_depth < max_depth:
+                self._scan_directory(entry.path, rel_prefix + entry.name + '/', max_depth, current_depth + 1, files)
+    
+    def build_file_tree(self, path: Path, max_depth: int = 4) -> Dict[str, Any]:
+        """Build a file tree structure"""
+        files = self.collect_files(str(path), max_depth)
+        
+        # Parsing is CPU-bound, so analyze files across processes
+        paths = [p for p, _ in files]
+        executor = _get_executor()
+        try:
+            results = list(executor.map(_analyze_file_worker, paths, chunksize=16))
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); replace the pool and retry once
+            _discard_executor(executor)
+            results = list(_get_executor().map(_analyze_file_worker, paths, chunksize=16))
+        
+        tree = {}
+        for (_, relative_path), (file_analysis, lines, dependencies) in zip(files, results):
+            self.total_files += 1
+            self.total_lines += lines
+            self.dependencies |= dependencies
+            
+            *parts, name = relative_path.split('/')
+            node = tree
+            for part in parts:
+                node = node.setdefault(part, {'type': 'directory', 'children': {}})['children']
+            file_node = node[name] = {
+                'type': 'file',
+                'path': relative_path,
+                'analysis': file_analysis
+            }
+            
+            module = '/'.join(parts) or '.'
+            self.module_files.setdefault(module, []).append((name, file_node))
+            self.edges.extend(
+                (relative_path, imported) for imported in self.imported_modules(file_analysis)
+            )
             
         return tree
     
+    def imported_modules(self, file_analysis: Dict[str, Any]) -> List[str]:
+        """Module names or specifiers imported by an analyzed file"""
+        return [
+            imp[len('from '):] if imp.startswith('from ') else imp
+            for imp in file_analysis.get('imports', [])
+        ]
+    
+    def resolve_import(self, source: str, imported: str, module_of: Dict[str, str]) -> Optional[str]:
+        """Map an import made by source to the repository module it refers to, if any"""
+        base = posixpath.dirname(source)
+        if source.endswith('.py'):
+            stem = imported.replace('.', '/')
+            # Try sibling modules first, then packages rooted at the repository
+            for root in (base, ''):
+                target = posixpath.normpath(posixpath.join(root, stem))
+                if target + '.py' in module_of:
+                    return module_of[target + '.py']
+                if target in self.module_files:
+                    return target
+            return None
+        
+        if not imported.startswith('.'):
+            # Bare JS specifiers name packages, not repository files
+            return None
+        target = posixpath.normpath(posixpath.join(base, imported))
+        candidates = [target]
+        candidates += [target + suffix for suffix in _JS_SUFFIXES]
+        candidates += [f"{target}/index{suffix}" for suffix in _JS_SUFFIXES]
+        return next((module_of[path] for path in candidates if path in module_of), None)
+    
+    def build_dependency_graph(self) -> Dict[str, List[str]]:
+        """Build the module graph from the import edges collected during analysis.
+
+        Modules are the directories files live in, plus all of their parent
+        directories. Each module maps to the other modules it imports from.
+        """
+        module_of = {}
+        for module, files in self.module_files.items():
+            for _, file_node in files:
+                module_of[file_node['path']] = module
+        
+        graph = {}
+        for module in self.module_files:
+            path = PurePosixPath(module)
+            for parent in (*reversed(path.parents), path):
+                graph.setdefault(parent.as_posix(), set())
+        
+        for source, imported in self.edges:
+            target = self.resolve_import(source, imported, module_of)
+            if target is not None and target != module_of[source]:
+                graph[module_of[source]].add(target)
+        
+        self.module_graph = {module: sorted(deps) for module, deps in graph.items()}
+        return self.module_graph
+    
+    def dependency_order(self) -> Tuple[List[str], Set[str]]:
+        """Modules ordered so that each comes after the modules it imports from.
+
+        Import cycles are broken one edge at a time; the second element holds
+        the modules that lost an edge and may precede a module they import.
+        """
+        # Copy the sorted lists so insertion order, and therefore the result,
+        # does not depend on the string hash seed
+        graph = {module: list(deps) for module, deps in self.module_graph.items()}
+        broken = set()
+        while True:
+            try:
+                return list(TopologicalSorter(graph).static_order()), broken
+            except CycleError as e:
+                # Each node in the cycle is imported by the next one; always drop
+                # the smallest (importer, imported) edge so the choice is stable
+                cycle = e.args[1]
+                importer, imported = min(zip(cycle[1:], cycle))
+                graph[importer].remove(imported)
+                broken.add(importer)
+    
     def generate_repo_map(self) -> Dict[str, Any]:
         """Generate the complete repository map"""
         self.structure = self.build_file_tree(self.repo_path)
         
-        # Get top dependencies
-        top_deps = sorted(list(self.dependencies))[:10]
+        self.build_dependency_graph()
+        
+        # Get top dependencies once; the tour reuses them
+        self._top_deps = heapq.nsmallest(10, self.dependencies)
         
         return {
             'repository_structure': self.structure,
             'statistics': {
                 'total_files': self.total_files,
                 'total_lines': self.total_lines,
-                'top_dependencies': top_deps
+                'top_dependencies': self._top_deps
             },
+            'module_graph': self.module_graph,
             'analysis_metadata': {
                 'repo_path': str(self.repo_path),
                 'analyzed_file_types': ['.py', '.js', '.jsx', '.ts', '.tsx', '.json', '.md']
             }
         }
     
+    def describe_file(self, name: str, analysis: Dict[str, Any], indent: str = "") -> str:
+        """One markdown list entry describing an analyzed file"""
+        counted, template = _TOUR_FILE_TEMPLATES.get(analysis.get('type'), (None, None))
+        if counted and analysis.get(counted):
+            return template.format(indent=indent, name=name, count=len(analysis[counted]))
+        return _TOUR_DEFAULT_TEMPLATE.format(indent=indent, name=name, lines=analysis.get('lines', 0))
+    
+    def module_label(self, module: str) -> str:
+        """Display name of a module directory, with the root shown as ./"""
+        return "./" if module == "." else f"{module}/"
+    
+    def explain_modules(self, buf: TextIO) -> None:
+        """Describe each module and its files, in dependency order"""
+        order, cyclic = self.dependency_order()
+        for module in order:
+            files = self.module_files.get(module)
+            if not files:
+                continue
+            
+            label = self.module_label(module)
+            deps = self.module_graph[module]
+            if deps:
+                imports_from = ', '.join(f"`{self.module_label(dep)}`" for dep in deps)
+                cycle_note = " (part of an import cycle)" if module in cyclic else ""
+                buf.write(f"- **{label}** - Module importing from {imports_from}{cycle_note}:\n")
+            else:
+                buf.write(f"- **{label}** - Module containing:\n")
+            
+            for name, file_node in files:
+                buf.write(self.describe_file(name, file_node.get('analysis', {}), indent="  "))
+    
     def generate_repo_tour(self) -> str:
         """Generate a guided tour in markdown format"""
-        tour = f"""# Repository Tour
+        buf = io.StringIO()
+        buf.write(f"""# Repository Tour
 
 ## 🏗️ Project Overview
 This repository contains **{self.total_files} files** with **{self.total_lines} lines of code**.
@@ -197,54 +512,36 @@ This repository contains **{self.total_files} files** with **{self.total_lines}
 ## 📊 Quick Stats
 - **Total Files:** {self.total_files}
 - **Lines of Code:** {self.total_lines}
-- **Key Dependencies:** {', '.join(sorted(list(self.dependencies))[:5])}
+- **Key Dependencies:** {', '.join(self._top_deps[:5])}
 
 ## 🗂️ Repository Structure
 
-"""
+Modules are listed in dependency order: each appears after the modules it imports from, except that a module marked as part of an import cycle may appear before one module it imports.
+
+""")
         
         # Add structure explanation
-        def explain_directory(tree: Dict, level: int = 0) -> str:
-            explanation = ""
-            indent = "  " * level
-            
-            for name, info in tree.items():
-                if info['type'] == 'directory':
-                    explanation += f"{indent}- **{name}/** - Directory containing:\n"
-                    explanation += explain_directory(info['children'], level + 1)
-                else:
-                    analysis = info.get('analysis', {})
-                    if analysis.get('type') == 'python' and analysis.get('classes'):
-                        explanation += f"{indent}- **{name}** - Python module with {len(analysis['classes'])} classes\n"
-                    elif analysis.get('type') == 'javascript' and analysis.get('functions'):
-                        explanation += f"{indent}- **{name}** - JavaScript file with {len(analysis['functions'])} functions\n"
-                    else:
-                        explanation += f"{indent}- **{name}** - {analysis.get('lines', 0)} lines\n"
-            
-            return explanation
+        self.explain_modules(buf)
         
-        tour += explain_directory(self.structure)
-        
-        tour += """
+        buf.write("""
 
 ## 🚀 Getting Started
 
 Based on the repository analysis, here's how the code is organized:
 
-"""
+""")
         
         # Find main files
-        main_files = []
-        for name, info in self.structure.items():
-            if info['type'] == 'file' and name in ['main.py', 'app.py', 'index.js', 'index.tsx', 'package.json']:
-                main_files.append(name)
+        main_files = [
+            name for name, info in self.structure.items()
+            if info['type'] == 'file' and name in ['main.py', 'app.py', 'index.js', 'index.tsx', 'package.json']
+        ]
         
         if main_files:
-            tour += f"### Key Files:\n"
-            for file in main_files:
-                tour += f"- **{file}** - Entry point or configuration file\n"
+            buf.write("### Key Files:\n")
+            buf.write(''.join(f"- **{file}** - Entry point or configuration file\n" for file in main_files))
         
-        tour += """
+        buf.write("""
 ## 🔧 Code Architecture
 
 The codebase follows standard conventions with clear separation of concerns. Key patterns identified:
@@ -256,41 +553,208 @@ The codebase follows standard conventions with clear separation of concerns. Key
 ## 📚 Dependencies
 
 This project relies on several key libraries:
-"""
+""")
         
-        for dep in sorted(list(self.dependencies))[:10]:
-            tour += f"- `{dep}`\n"
+        buf.write(''.join(f"- `{dep}`\n" for dep in self._top_deps))
         
-        return tour
+        return buf.getvalue()
+
+# Language-specific analyzers keyed by lowercased file suffix
+_SUFFIX_DISPATCH = {
+    '.py': RepoAnalysis.analyze_python_file,
+    '.js': RepoAnalysis.analyze_javascript_file,
+    '.jsx': RepoAnalysis.analyze_javascript_file,
+    '.ts': RepoAnalysis.analyze_javascript_file,
+    '.tsx': RepoAnalysis.analyze_javascript_file,
+}
+
+# On-disk cache of per-file results, shared across runs. Bump the version
+# whenever the analyzers change what they return. The location can be set
+# with REPOPILOT_CACHE_DIR (an empty value disables caching). Entries unused
+# for _CACHE_MAX_AGE seconds are evicted, then the least recently used ones
+# until the cache fits in _CACHE_MAX_BYTES.
+_CACHE_VERSION = b'6'
+_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_CACHE_MAX_AGE = 7 * 24 * 3600
+
+@functools.lru_cache(maxsize=None)
+def _cache_dir() -> Optional[Path]:
+    """Resolve the cache directory, or None when there is no usable location"""
+    configured = os.environ.get('REPOPILOT_CACHE_DIR')
+    if configured is not None:
+        return Path(configured) if configured else None
+    try:
+        return Path.home() / '.cache' / 'repopilot'
+    except RuntimeError:
+        # No HOME and no passwd entry, as in some containers
+        return None
+
+def _cache_key(file_path: Path) -> Optional[str]:
+    """Derive a cache key from the interpreter version and the file's suffix, size and content"""
+    digest = hashlib.sha1(_CACHE_VERSION, usedforsecurity=False)
+    # Parse results depend on the grammar of the running interpreter
+    digest.update('{}.{}'.format(*sys.version_info[:2]).encode())
+    digest.update(file_path.suffix.lower().encode())
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > _MAX_ANALYZED_BYTES:
+                # Oversized files are never parsed, so there is nothing to cache
+                return None
+            digest.update(str(size).encode())
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+def _load_cached(key: str) -> Optional[Tuple[Dict[str, Any], int, Set[str]]]:
+    """Return a cached result, or None on a miss or unreadable entry"""
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return None
+    entry = cache_dir / f"{key}.pkl"
+    try:
+        with open(entry, 'rb') as f:
+            result = pickle.load(f)
+    except Exception:
+        return None
+    try:
+        # Refresh the mtime so eviction drops the least recently used entries
+        os.utime(entry)
+    except OSError:
+        pass
+    return result
+
+def _store_cached(key: str, result: Tuple[Dict[str, Any], int, Set[str]]) -> None:
+    """Write a result to the cache; failures only cost a future re-parse"""
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent workers never read a partial file
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix='.tmp', delete=False) as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, cache_dir / f"{key}.pkl")
+    except OSError:
+        pass
+
+def _prune_cache() -> None:
+    """Evict stale cache entries, then the oldest ones above the size cap"""
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(('.pkl', '.tmp')):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+    
+    entries.sort()
+    cutoff = time.time() - _CACHE_MAX_AGE
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in entries:
+        if mtime >= cutoff and total <= _CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+def _analyze_file_worker(file_path: str) -> Tuple[Dict[str, Any], int, Set[str]]:
+    """Analyze a single file in a worker process.
+
+    The analysis runs on a throwaway RepoAnalysis so the file's line count
+    and dependencies can be sent back and merged by the parent process.
+    Results are looked up in the on-disk cache first.
+    """
+    path = Path(file_path)
+    key = _cache_key(path)
+    result = _load_cached(key) if key else None
+    if result is None:
+        analyzer = RepoAnalysis(path.parent)
+        file_analysis = analyzer.analyze_file(path)
+        result = (file_analysis, analyzer.total_lines, analyzer.dependencies)
+        if key:
+            _store_cached(key, result)
+    return result
+
+# One process pool shared by all requests, so concurrent analyses queue for
+# the same bounded set of workers. Workers are started by forkserver (spawn
+# where unavailable) because the pool is first used from a thread, and
+# forking a multi-threaded server process can deadlock the child.
+_MAX_WORKERS = min(os.cpu_count() or 1, 8)
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Return the shared analysis process pool, creating it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _executor = ProcessPoolExecutor(
+                max_workers=_MAX_WORKERS,
+                mp_context=multiprocessing.get_context(method)
+            )
+        return _executor
+
+def _discard_executor(broken: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next _get_executor call starts a fresh one"""
+    global _executor
+    with _executor_lock:
+        # Another request may already have replaced it
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False)
 
 def clone_repository(repo_url: str) -> str:
     """Clone a GitHub repository to a temporary directory"""
     temp_dir = tempfile.mkdtemp()
     try:
+        # Only the working tree is analyzed, so skip history, other branches and tags
         subprocess.run(
-            ['git', 'clone', repo_url, temp_dir],
+            ['git', 'clone', '--depth=1', '--single-branch', '--no-tags', repo_url, temp_dir],
             check=True,
             capture_output=True,
-            text=True
+            text=True,
+            env={**os.environ, 'GIT_TERMINAL_PROMPT': '0'}
         )
         return temp_dir
     except subprocess.CalledProcessError as e:
         raise HTTPException(status_code=400, detail=f"Failed to clone repository: {e.stderr}")
 
+def _run_analysis(repo_path: str) -> Tuple[Dict[str, Any], str]:
+    """Build the repository map and guided tour for a cloned repository"""
+    analyzer = RepoAnalysis(repo_path)
+    repo_map = analyzer.generate_repo_map()
+    repo_tour = analyzer.generate_repo_tour()
+    return repo_map, repo_tour
+
 @app.post("/analyze-repo")
-async def analyze_repository(request: RepoRequest):
+async def analyze_repository(request: RepoRequest, background: BackgroundTasks):
     """Main endpoint to analyze a GitHub repository"""
     try:
         # Clone the repository
-        repo_path = clone_repository(request.repo_url)
+        repo_path = await asyncio.to_thread(clone_repository, request.repo_url)
         
-        # Analyze the repository
-        analyzer = RepoAnalysis(repo_path)
-        repo_map = analyzer.generate_repo_map()
-        repo_tour = analyzer.generate_repo_tour()
+        # Clean up and trim the cache once the response has been sent,
+        # whether or not analysis succeeds
+        background.add_task(shutil.rmtree, repo_path, ignore_errors=True)
+        background.add_task(_prune_cache)
         
-        # Clean up
-        shutil.rmtree(repo_path)
+        # Analyze the repository
+        repo_map, repo_tour = await asyncio.to_thread(_run_analysis, repo_path)
         
         return {
             'success': True,
@@ -305,6 +769,15 @@ async def analyze_repository(request: RepoRequest):
             'error': str(e)
         }
 
+@app.on_event("shutdown")
+def shutdown_executor():
+    """Stop the analysis workers when the server shuts down"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(cancel_futures=True)
+            _executor = None
+
 @app.get("/")
 async def root():
     return {"message": "RepoPilot API is running!"}
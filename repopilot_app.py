@@ -1,11 +1,13 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import pandas as pd
 from typing import Dict, Any, List
 import re
-from urllib.parse import urlparse
 import time
+import functools
 
 # Page configuration
 st.set_page_config(
@@ -117,9 +119,58 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Scheme, github.com host, then the owner and repository path segments
+_GITHUB_URL_RE = re.compile(r'^[A-Za-z][A-Za-z0-9+.-]*://github\.com/([^/?#]+)/([^/?#]+)[^?#]*')
+
+class AnalysisError(Exception):
+    """The backend answered but reported that the analysis failed"""
+
+@st.cache_resource
+def _get_http_session() -> requests.Session:
+    """Pooled HTTP session shared across Streamlit reruns"""
+    session = requests.Session()
+    # Every POST to /analyze starts a clone and a full analysis, so it is only
+    # retried when the backend never received it (connect errors) or turned
+    # it away (502/503). Read errors and timeouts are never re-sent.
+    retries = Retry(
+        total=3,
+        connect=3,
+        read=0,
+        other=0,
+        status=3,
+        backoff_factor=0.5,
+        status_forcelist=[502, 503],
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {'POST'}
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_analysis(_session: requests.Session, api_base_url: str, url: str) -> Dict[str, Any]:
+    """POST a repository to the analyze endpoint, reusing results for an hour.
+
+    Errors propagate to the caller and are not cached, including failures
+    the backend reports as a 200 with success set to False. The session is
+    not part of the cache key.
+    """
+    payload = {"repository_url": url}
+    response = _session.post(
+        f"{api_base_url}/analyze",
+        json=payload,
+        timeout=300  # 5 minute timeout for large repos
+    )
+    response.raise_for_status()
+    result = response.json()
+    if result.get('success') is False:
+        raise AnalysisError(result.get('error') or 'unknown error')
+    return result
+
 class RepoPilotApp:
     def __init__(self):
         self.api_base_url = "http://localhost:8000"  # Adjust as needed
+        self._session = _get_http_session()
         self.init_session_state()
     
     def init_session_state(self):
@@ -131,30 +182,28 @@ class RepoPilotApp:
         if 'processing' not in st.session_state:
             st.session_state.processing = False
     
-    def validate_github_url(self, url: str) -> bool:
+    # The sidebar checks the same URL several times per run, so both URL
+    # helpers are memoized; the cached dicts are shared and must not be mutated
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def validate_github_url(url: str) -> bool:
         """Validate if the provided URL is a valid GitHub repository URL"""
-        try:
-            parsed = urlparse(url)
-            return (
-                parsed.netloc == 'github.com' and
-                len(parsed.path.strip('/').split('/')) >= 2 and
-                not parsed.path.endswith('.git')
-            )
-        except:
-            return False
+        match = _GITHUB_URL_RE.match(url)
+        return match is not None and not match.group(0).endswith('.git')
     
-    def extract_repo_info(self, url: str) -> Dict[str, str]:
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def extract_repo_info(url: str) -> Dict[str, str]:
         """Extract owner and repo name from GitHub URL"""
-        try:
-            parsed = urlparse(url)
-            path_parts = parsed.path.strip('/').split('/')
-            return {
-                'owner': path_parts[0],
-                'repo': path_parts[1],
-                'full_name': f"{path_parts[0]}/{path_parts[1]}"
-            }
-        except:
+        match = _GITHUB_URL_RE.match(url)
+        if match is None:
             return {}
+        owner, repo = match.group(1), match.group(2)
+        return {
+            'owner': owner,
+            'repo': repo,
+            'full_name': f"{owner}/{repo}"
+        }
     
     def create_gitdiagram_url(self, github_url: str) -> str:
         """Convert GitHub URL to GitDiagram URL"""
@@ -163,17 +212,13 @@ class RepoPilotApp:
     def analyze_repository(self, url: str) -> Dict[str, Any]:
         """Send repository URL to FastAPI analyze endpoint"""
         try:
-            payload = {"repository_url": url}
-            response = requests.post(
-                f"{self.api_base_url}/analyze",
-                json=payload,
-                timeout=300  # 5 minute timeout for large repos
-            )
-            response.raise_for_status()
-            return response.json()
+            return _fetch_analysis(self._session, self.api_base_url, url)
         except requests.exceptions.RequestException as e:
             st.error(f"API Error: {str(e)}")
             return None
+        except AnalysisError as e:
+            st.error(f"Analysis failed: {str(e)}")
+            return None
         except Exception as e:
             st.error(f"Unexpected error: {str(e)}")
             return None
@@ -183,27 +228,43 @@ class RepoPilotApp:
         if not query:
             return data
         
-        query = query.lower()
+        matches = re.compile(re.escape(query), re.IGNORECASE).search
         filtered_data = {}
+        # (source, filtered copy) pairs still to visit, and every container
+        # created along the way so empty ones can be pruned afterwards
+        stack = [(data, filtered_data)]
+        created = []
         
-        for key, value in data.items():
-            if isinstance(value, dict):
-                filtered_value = self.filter_json_data(value, query)
-                if filtered_value or query in key.lower():
-                    filtered_data[key] = filtered_value
-            elif isinstance(value, list):
-                filtered_list = []
-                for item in value:
-                    if isinstance(item, str) and query in item.lower():
-                        filtered_list.append(item)
+        while stack:
+            src, dst = stack.pop()
+            if isinstance(src, dict):
+                for key, value in src.items():
+                    if matches(key):
+                        # A matching key keeps its whole subtree as-is
+                        dst[key] = value
+                    elif isinstance(value, (dict, list)):
+                        child = {} if isinstance(value, dict) else []
+                        dst[key] = child
+                        created.append((dst, key, child))
+                        stack.append((value, child))
+                    elif isinstance(value, str) and matches(value):
+                        dst[key] = value
+            else:
+                for item in src:
+                    if isinstance(item, str):
+                        if matches(item):
+                            dst.append(item)
                     elif isinstance(item, dict):
-                        filtered_item = self.filter_json_data(item, query)
-                        if filtered_item:
-                            filtered_list.append(filtered_item)
-                if filtered_list:
-                    filtered_data[key] = filtered_list
-            elif isinstance(value, str) and (query in value.lower() or query in key.lower()):
-                filtered_data[key] = value
+                        child = {}
+                        created.append((dst, len(dst), child))
+                        dst.append(child)
+                        stack.append((item, child))
+        
+        # Children were created after their parents, so walking backwards
+        # prunes bottom-up and list indices stay valid
+        for parent, slot, child in reversed(created):
+            if not child:
+                del parent[slot]
         
         return filtered_data
     